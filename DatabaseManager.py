@@ -1,16 +1,248 @@
 import os
+import json
+import time
+import queue
+import asyncio
+import atexit
+import pathlib
 import sqlite3
+import threading
+import contextlib
 import datetime
 import logging
-import pytz
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
 
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
 logger = logging.getLogger(__name__)
 
-eastern = pytz.timezone("US/Eastern")
+eastern = ZoneInfo("US/Eastern")
+
+# Connection-level tuning applied to every connection we open. WAL lets the
+# reminder/intro readers run alongside writers and NORMAL sync drops the
+# per-commit fsync count; the remaining settings are per-connection caches.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Number of read-only connections kept open next to the single writer
+READER_POOL_SIZE = 4
+
+# Users who joined at least this long ago without posting get an intro reminder
+INTRO_REMINDER_DELAY_SECONDS = 3 * 24 * 60 * 60
+
+# Size of sqlite3's per-connection prepared statement cache
+CACHED_STATEMENTS = 256
+
+# Bump whenever SCHEMA_SQL changes; init_database skips all DDL when the
+# file's PRAGMA user_version already matches
+SCHEMA_VERSION = 2
+
+# Full schema, run as one script in a single transaction. Every statement is
+# idempotent so databases created before versioning upgrade in place.
+SCHEMA_SQL = f"""
+BEGIN;
+
+-- Users table for tracking new members and their intro schedules
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    chat_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    username TEXT,
+    first_name TEXT,
+    join_time INTEGER NOT NULL,
+    welcomed BOOLEAN DEFAULT 0,
+    intro_sent BOOLEAN DEFAULT 0,
+    notification_subscription BOOLEAN DEFAULT 0,
+    user_posted BOOLEAN DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(chat_id, user_id)
+);
+
+-- Events table for scheduled events
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    chat_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    sender_id INTEGER NOT NULL,
+    event_datetime TIMESTAMP NOT NULL,
+    location TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Reminders already sent, bit (1 << days-before offset) per reminder
+    reminders_sent_mask INTEGER NOT NULL DEFAULT 0,
+    UNIQUE(chat_id, message_id)
+);
+
+-- Sent reminders used to live in an event_reminders child table; the
+-- migration folds its rows into reminders_sent_mask
+DROP TRIGGER IF EXISTS events_delete_reminders;
+DROP TABLE IF EXISTS event_reminders;
+
+-- A rescheduled event gets its full set of reminders again
+DROP TRIGGER IF EXISTS events_reschedule_reminders;
+CREATE TRIGGER events_reschedule_reminders
+AFTER UPDATE OF event_datetime ON events
+WHEN OLD.event_datetime != NEW.event_datetime
+BEGIN
+    UPDATE events SET reminders_sent_mask = 0 WHERE id = NEW.id;
+END;
+
+-- join_time used to be stored as an Eastern ISO string; convert any such
+-- rows to unix seconds
+UPDATE users
+SET join_time = CAST(strftime('%s', join_time) AS INTEGER)
+WHERE typeof(join_time) = 'text';
+
+-- Partial indexes matching the scheduler queries, so the daily welcome/intro
+-- jobs and event reminders avoid full table scans
+CREATE INDEX IF NOT EXISTS idx_users_intro ON users(join_time)
+WHERE user_posted = 0 AND intro_sent = 0 AND chat_id < 0;
+CREATE INDEX IF NOT EXISTS idx_users_welcome ON users(join_time)
+WHERE welcomed = 0 AND chat_id < 0;
+CREATE INDEX IF NOT EXISTS idx_events_dt ON events(event_datetime);
+
+PRAGMA user_version = {SCHEMA_VERSION};
+COMMIT;
+"""
+
+# Adds reminders_sent_mask to an events table created before it existed,
+# carrying over reminders recorded in the old event_reminders table. Runs
+# before SCHEMA_SQL, which then drops that table.
+SQL_MIGRATE_REMINDERS_MASK = """
+BEGIN;
+ALTER TABLE events ADD COLUMN reminders_sent_mask INTEGER NOT NULL DEFAULT 0;
+CREATE TABLE IF NOT EXISTS event_reminders (event_id INTEGER, day INTEGER);
+UPDATE events SET reminders_sent_mask = (
+    SELECT coalesce(sum(1 << day), 0)
+    FROM event_reminders
+    WHERE event_id = events.id
+);
+COMMIT;
+"""
+
+# SQL statements, kept as module constants so every call passes the identical
+# string and hits the prepared statement cache of the long-lived connections
+SQL_INSERT_USER = """
+    INSERT INTO users
+    (chat_id, user_id, username, first_name, join_time)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(chat_id, user_id) DO NOTHING
+"""
+
+# Private-chat users never get welcomes or intro reminders, so they are
+# created (or refreshed) with every flag already set
+SQL_UPSERT_PRIVATE_CHAT_USER = """
+    INSERT INTO users
+    (chat_id, user_id, username, first_name, join_time,
+     welcomed, intro_sent, user_posted)
+    VALUES (?, ?, ?, ?, ?, 1, 1, 1)
+    ON CONFLICT(chat_id, user_id) DO UPDATE SET
+        username = excluded.username,
+        first_name = excluded.first_name,
+        welcomed = 1,
+        intro_sent = 1,
+        user_posted = 1
+"""
+
+SQL_GET_USER_PRIVATE_CHAT = """
+    SELECT user_id, username, first_name, notification_subscription
+    FROM users
+    WHERE chat_id = ? AND user_id = ?
+"""
+
+SQL_TOGGLE_NOTIFICATION = """
+    UPDATE users SET notification_subscription = NOT notification_subscription
+    WHERE chat_id = ? AND user_id = ?
+    RETURNING notification_subscription
+"""
+
+SQL_GET_USERS_FOR_NOTIFICATION = """
+    SELECT chat_id, user_id, username, first_name
+    FROM users
+    WHERE notification_subscription = 1
+"""
+
+SQL_GET_UNWELCOMED_USERS = """
+    SELECT chat_id, user_id, username, first_name
+    FROM users
+    WHERE welcomed = 0 AND chat_id < 0
+    ORDER BY join_time ASC
+"""
+
+SQL_GET_INTRO_USERS = """
+    SELECT chat_id, user_id, username, first_name
+    FROM users
+    WHERE user_posted = 0
+    AND intro_sent = 0
+    AND join_time <= ?
+    AND chat_id < 0
+    ORDER BY join_time ASC
+"""
+
+# Boolean users columns that are set in bulk, with their log labels. Each gets
+# one fixed statement executed per user, so the prepared statement is reused
+# whatever the batch size.
+USER_FLAGS = {
+    "welcomed": "welcomed",
+    "intro_sent": "intro sent",
+    "user_posted": "posted",
+}
+SQL_MARK_USER_FLAG = {
+    flag: f"UPDATE users SET {flag} = 1 "
+    f"WHERE chat_id = ? AND user_id = ? AND {flag} = 0"
+    for flag in USER_FLAGS
+}
+
+SQL_UPSERT_EVENT = """
+    INSERT INTO events
+    (chat_id, message_id, sender_id, event_datetime, location, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(chat_id, message_id) DO UPDATE SET
+        event_datetime = excluded.event_datetime,
+        location = excluded.location,
+        updated_at = excluded.updated_at
+"""
+
+SQL_GET_EVENT = """
+    SELECT event_datetime, location FROM events
+    WHERE chat_id = ? AND message_id = ?
+"""
+
+SQL_GET_EVENTS_ON_DATES = """
+    SELECT id, chat_id, message_id, sender_id, event_datetime, location, updated_at
+    FROM events
+    WHERE event_datetime > ? AND event_datetime < ?
+    AND substr(event_datetime, 1, 10) IN (SELECT value FROM json_each(?))
+"""
+
+SQL_MARK_REMINDER_SENT = """
+    UPDATE events SET reminders_sent_mask = reminders_sent_mask | ?
+    WHERE id = ? AND reminders_sent_mask & ? = 0
+"""
+
+SQL_DELETE_EVENT = """
+    DELETE FROM events WHERE chat_id = ? AND message_id = ?
+"""
+
+SQL_PURGE_EXPIRED_EVENTS = """
+    DELETE FROM events WHERE event_datetime < ?
+"""
+
+
+class EventRecord(NamedTuple):
+    """An upcoming event as yielded by get_events_due."""
+
+    id: int
+    chat_id: int
+    message_id: int
+    sender_id: int
+    event_datetime: datetime.datetime
+    location: str
+    updated_at: str
 
 
 class DatabaseManager:
@@ -18,6 +250,21 @@ class DatabaseManager:
         self.db_path = db_path
         self.init_database()
 
+        # WAL allows one writer alongside any number of readers, so keep a
+        # single long-lived writer (autocommit, serialized by a lock) and a
+        # pool of read-only connections for the get_* methods.
+        self._writer_lock = threading.Lock()
+        self._writer = self._connect(self.db_path, isolation_level=None)
+        # Keep dirty pages in memory until commit rather than spilling early
+        self._writer.execute("PRAGMA cache_spill=0")
+        self._read_uri = (
+            pathlib.Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        )
+        self._readers = queue.Queue(maxsize=READER_POOL_SIZE)
+        for _ in range(READER_POOL_SIZE):
+            self._readers.put(self._connect(self._read_uri, uri=True))
+        atexit.register(self.close)
+
     def init_database(self):
         """Initialize the database with required tables."""
         # Ensure directory exists
@@ -25,395 +272,483 @@ class DatabaseManager:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         except (OSError, PermissionError) as e:
             logger.warning(
-                f"Could not create directory {os.path.dirname(self.db_path)}: {e}"
+                "Could not create directory %s: %s",
+                os.path.dirname(self.db_path),
+                e,
             )
             # Fallback to current directory
             self.db_path = "./bot.sqlite"
-            logger.info(f"Using fallback database path: {self.db_path}")
+            logger.info("Using fallback database path: %s", self.db_path)
 
         conn = sqlite3.connect(self.db_path)
         try:
-            cursor = conn.cursor()
-
-            # Users table for tracking new members and their intro schedules
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY,
-                    chat_id INTEGER NOT NULL,
-                    user_id INTEGER NOT NULL,
-                    username TEXT,
-                    first_name TEXT,
-                    join_time TIMESTAMP NOT NULL,
-                    welcomed BOOLEAN DEFAULT 0,
-                    intro_sent BOOLEAN DEFAULT 0,
-                    notification_subscription BOOLEAN DEFAULT 0,
-                    user_posted BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(chat_id, user_id)
-                )
-            """
-            )
+            (user_version,) = conn.execute("PRAGMA user_version").fetchone()
+            if user_version == SCHEMA_VERSION:
+                logger.info("Database schema is up to date")
+                return
 
-            # Events table for scheduled events
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS events (
-                    id INTEGER PRIMARY KEY,
-                    chat_id INTEGER NOT NULL,
-                    message_id INTEGER NOT NULL,
-                    sender_id INTEGER NOT NULL,
-                    event_datetime TIMESTAMP NOT NULL,
-                    location TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(chat_id, message_id)
-                )
-            """
-            )
+            # WAL is persistent in the database file, so it only has to be
+            # switched on once; in-memory databases cannot use it.
+            if self.db_path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
 
-            conn.commit()
+            columns = {
+                row[1] for row in conn.execute("PRAGMA table_info(events)")
+            }
+            if columns and "reminders_sent_mask" not in columns:
+                conn.executescript(SQL_MIGRATE_REMINDERS_MASK)
+
+            conn.executescript(SCHEMA_SQL)
             logger.info("Database initialized successfully")
 
         except Exception as e:
-            logger.error(f"Error initializing database: {e}")
+            logger.error("Error initializing database: %s", e)
             raise
         finally:
             conn.close()
 
-    def get_connection(self):
-        """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
-        # Set row factory to return Row objects for easier column access
-        conn.row_factory = sqlite3.Row
+    def _connect(self, database, **kwargs):
+        """Open a pooled connection with the tuning PRAGMAs applied."""
+        conn = sqlite3.connect(
+            database,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+            **kwargs,
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
 
-    def add_new_user(self, chat_id, user_id, username, first_name):
-        """Add a new user to the database."""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO users
-                (chat_id, user_id, username, first_name, join_time)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (
-                    chat_id,
-                    user_id,
-                    username,
-                    first_name,
-                    datetime.datetime.now(eastern).isoformat(),
-                ),
-            )
-            conn.commit()
-            logger.info(f"Added user {user_id} to database")
-        except Exception as e:
-            logger.error(f"Error adding user: {e}")
-        finally:
-            conn.close()
+    @staticmethod
+    def _fetch_row(conn, sql, params):
+        """Fetch one row as a sqlite3.Row for callers reading by column name.
 
-    def get_user_private_chat(self, user_id):
-        """Get user details from the database."""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT * FROM users
-                WHERE chat_id = ? AND user_id = ?
-            """,
-                (user_id, user_id),
-            )
-            return cursor.fetchone()
-        except Exception as e:
-            logger.error(f"Error getting user: {e}")
-            return None
-        finally:
-            conn.close()
+        Connections return plain tuples; only these lookups pay for Row.
+        """
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor.execute(sql, params).fetchone()
 
-    def mark_user_posted(self, chat_id, user_id):
-        """Mark that a user has posted a message."""
-        conn = self.get_connection()
+    @contextlib.contextmanager
+    def _acquire_reader(self):
+        """Check a read-only connection out of the pool."""
+        conn = self._readers.get()
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE users SET user_posted = 1
-                WHERE chat_id = ? AND user_id = ? AND user_posted = 0
-            """,
-                (chat_id, user_id),
-            )
-            conn.commit()
-            logger.info(f"Marked user {user_id} as posted")
-        except Exception as e:
-            logger.error(f"Error marking user as posted: {e}")
+            yield conn
         finally:
-            conn.close()
+            self._readers.put(conn)
 
-    def get_user_notification_status(self, user_id):
-        """Get the notification subscription status for a user."""
-        conn = self.get_connection()
+    @contextlib.contextmanager
+    def _acquire_writer(self):
+        """Take exclusive use of the writer connection."""
+        with self._writer_lock:
+            yield self._writer
+
+    @contextlib.contextmanager
+    def _write_transaction(self):
+        """Run the enclosed writes inside one BEGIN/COMMIT on the writer."""
+        with self._acquire_writer() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        """Close the writer and every pooled reader connection."""
+        with self._writer_lock:
+            # Refresh planner statistics the session found stale
+            try:
+                self._writer.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.debug("Could not optimize database: %s", e)
+            self._writer.close()
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def add_new_users(self, rows):
+        """Add several (chat_id, user_id, username, first_name) rows at once."""
+        if not rows:
+            return
+        join_time = int(time.time())
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT notification_subscription
-                FROM users
-                WHERE user_id = ? AND chat_id = ?
-            """,
-                (user_id, user_id),
-            )
-            result = cursor.fetchone()
-            return result["notification_subscription"] if result else None
+            with self._write_transaction() as conn:
+                conn.executemany(
+                    SQL_INSERT_USER,
+                    [row + (join_time,) for row in rows],
+                )
+            logger.info("Added %d users to database", len(rows))
         except Exception as e:
-            logger.error(f"Error getting user notification status: {e}")
-            return None
-        finally:
-            conn.close()
+            logger.error("Error adding users: %s", e)
+
+    def upsert_private_chat_user(
+        self, chat_id, user_id, username, first_name
+    ):
+        """Create or refresh a private-chat user with every flag set."""
+        with self._acquire_writer() as conn:
+            try:
+                conn.execute(
+                    SQL_UPSERT_PRIVATE_CHAT_USER,
+                    (
+                        chat_id,
+                        user_id,
+                        username,
+                        first_name,
+                        int(time.time()),
+                    ),
+                )
+            except Exception as e:
+                logger.error("Error upserting private chat user: %s", e)
+
+    def get_user_private_chat(self, user_id):
+        """Get user details, including the subscription status."""
+        with self._acquire_reader() as conn:
+            try:
+                return self._fetch_row(
+                    conn, SQL_GET_USER_PRIVATE_CHAT, (user_id, user_id)
+                )
+            except Exception as e:
+                logger.error("Error getting user: %s", e)
+                return None
+
+    def mark_many_users_posted(self, pairs):
+        """Mark (chat_id, user_id) pairs from any chats as having posted.
+
+        Returns False if the write failed.
+        """
+        return self._mark_pairs_flag("user_posted", pairs)
 
     def toggle_notification_subscription(self, user_id):
-        """Toggle the notification subscription for a user."""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE users SET notification_subscription = NOT notification_subscription
-                WHERE chat_id = ? AND user_id = ?
-            """,
-                (user_id, user_id),
-            )
-            conn.commit()
-            logger.info(
-                f"Toggled notification subscription for user {user_id}"
-            )
-        except Exception as e:
-            logger.error(f"Error toggling notification subscription: {e}")
-        finally:
-            conn.close()
+        """Toggle the notification subscription for a user.
+
+        Returns the new subscription status, or None if it failed.
+        """
+        with self._acquire_writer() as conn:
+            try:
+                result = conn.execute(
+                    SQL_TOGGLE_NOTIFICATION,
+                    (user_id, user_id),
+                ).fetchone()
+                logger.debug(
+                    "Toggled notification subscription for user %s", user_id
+                )
+                return result[0] if result else None
+            except Exception as e:
+                logger.error(
+                    "Error toggling notification subscription: %s", e
+                )
+                return None
 
     def get_users_for_notification(self):
         """Get users who are subscribed to notifications."""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT chat_id, user_id, username, first_name
-                FROM users
-                WHERE notification_subscription = 1
-            """
-            )
-            return cursor.fetchall()
-        except Exception as e:
-            logger.error(f"Error getting users for notification: {e}")
-            return []
-        finally:
-            conn.close()
+        with self._acquire_reader() as conn:
+            try:
+                return conn.execute(SQL_GET_USERS_FOR_NOTIFICATION).fetchall()
+            except Exception as e:
+                logger.error("Error getting users for notification: %s", e)
+                return []
 
     def get_unwelcomed_users_non_private(self):
         """Get all users who haven't been welcomed yet in non-private chats."""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT chat_id, user_id, username, first_name
-                FROM users
-                WHERE welcomed = 0 AND chat_id < 0
-                ORDER BY join_time ASC
-            """
-            )
-            return cursor.fetchall()
-        except Exception as e:
-            logger.error(f"Error getting unwelcomed users: {e}")
-            return []
-        finally:
-            conn.close()
+        with self._acquire_reader() as conn:
+            try:
+                return conn.execute(SQL_GET_UNWELCOMED_USERS).fetchall()
+            except Exception as e:
+                logger.error("Error getting unwelcomed users: %s", e)
+                return []
 
-    def mark_users_welcomed(self, chat_id, user_ids):
-        """Mark multiple users as welcomed."""
-        if not user_ids:
-            return
-        conn = self.get_connection()
+    def _mark_pairs_flag(self, flag, pairs):
+        """Set a boolean users column for (chat_id, user_id) pairs at once.
+
+        Returns False if the transaction failed and nothing was written.
+        """
+        if not pairs:
+            return True
         try:
-            cursor = conn.cursor()
-            placeholders = ",".join("?" * len(user_ids))
-            cursor.execute(
-                f"""
-                UPDATE users SET welcomed = 1
-                WHERE chat_id = ? AND user_id IN ({placeholders})
-            """,
-                [chat_id] + user_ids,
-            )
-            conn.commit()
-            logger.info(f"Marked {len(user_ids)} users as welcomed")
+            with self._write_transaction() as conn:
+                conn.executemany(SQL_MARK_USER_FLAG[flag], pairs)
+            logger.info("Marked %d users as %s", len(pairs), USER_FLAGS[flag])
+            return True
         except Exception as e:
-            logger.error(f"Error marking users as welcomed: {e}")
-        finally:
-            conn.close()
+            logger.error("Error marking users as %s: %s", USER_FLAGS[flag], e)
+            return False
+
+    def mark_many_users_welcomed(self, pairs):
+        """Mark (chat_id, user_id) pairs from any chats as welcomed."""
+        self._mark_pairs_flag("welcomed", pairs)
 
     def get_users_for_intro_reminder(self):
         """Get ALL users who need intro reminders (joined 3+ days ago, not posted, not yet sent intro)."""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            now = datetime.datetime.now(eastern)
-            # Users who joined 3+ days ago
-            target_time = (now - datetime.timedelta(days=3)).isoformat()
-
-            cursor.execute(
-                """
-                SELECT chat_id, user_id, username, first_name
-                FROM users
-                WHERE user_posted = 0
-                AND intro_sent = 0
-                AND join_time <= ?
-                AND chat_id < 0
-                ORDER BY join_time ASC
-            """,
-                (target_time,),
-            )
-            return cursor.fetchall()
-        except Exception as e:
-            logger.error(f"Error getting users for intro reminder: {e}")
-            return []
-        finally:
-            conn.close()
+        with self._acquire_reader() as conn:
+            try:
+                # Users who joined 3+ days ago
+                target_time = int(time.time()) - INTRO_REMINDER_DELAY_SECONDS
+                return conn.execute(
+                    SQL_GET_INTRO_USERS, (target_time,)
+                ).fetchall()
+            except Exception as e:
+                logger.error("Error getting users for intro reminder: %s", e)
+                return []
 
-    def mark_users_intro_sent(self, chat_id, user_ids):
-        """Mark multiple users as having received intro reminder."""
-        if not user_ids:
-            return
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            placeholders = ",".join("?" * len(user_ids))
-            cursor.execute(
-                f"""
-                UPDATE users SET intro_sent = 1
-                WHERE chat_id = ? AND user_id IN ({placeholders})
-            """,
-                [chat_id] + user_ids,
-            )
-            conn.commit()
-            logger.info(f"Marked {len(user_ids)} users as intro sent")
-        except Exception as e:
-            logger.error(f"Error marking users as intro sent: {e}")
-        finally:
-            conn.close()
+    def mark_many_users_intro_sent(self, pairs):
+        """Mark (chat_id, user_id) pairs from any chats as intro sent."""
+        self._mark_pairs_flag("intro_sent", pairs)
 
     def add_event(
         self, chat_id, message_id, sender_id, event_datetime, location
     ):
         """Add or update an event."""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO events
-                (chat_id, message_id, sender_id, event_datetime, location, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    chat_id,
-                    message_id,
-                    sender_id,
-                    event_datetime,
-                    location,
-                    datetime.datetime.now(eastern).isoformat(),
-                ),
-            )
-            conn.commit()
-            logger.info(f"Added/updated event {message_id}")
-        except Exception as e:
-            logger.error(f"Error adding event: {e}")
-        finally:
-            conn.close()
+        with self._acquire_writer() as conn:
+            try:
+                conn.execute(
+                    SQL_UPSERT_EVENT,
+                    (
+                        chat_id,
+                        message_id,
+                        sender_id,
+                        event_datetime,
+                        location,
+                        datetime.datetime.now(eastern).isoformat(),
+                    ),
+                )
+                logger.info("Added/updated event %s", message_id)
+            except Exception as e:
+                logger.error("Error adding event: %s", e)
 
     def get_event(self, chat_id, message_id):
         """Find an event by chat_id and message_id."""
-        conn = self.get_connection()
+        with self._acquire_reader() as conn:
+            try:
+                return self._fetch_row(
+                    conn, SQL_GET_EVENT, (chat_id, message_id)
+                )
+            except Exception as e:
+                logger.error("Error finding event: %s", e)
+                return None
+
+    @staticmethod
+    def _parse_event(row):
+        """Build an EventRecord from an events row, or None if unparsable."""
+        (
+            event_id,
+            chat_id,
+            message_id,
+            sender_id,
+            event_datetime,
+            location,
+            updated_at,
+        ) = row
+        # Parse the datetime string back to datetime object
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT * FROM events
-                WHERE chat_id = ? AND message_id = ?
-            """,
-                (chat_id, message_id),
+            event_dt = datetime.datetime.fromisoformat(event_datetime)
+        except (ValueError, TypeError) as e:
+            logger.error(
+                "Error parsing event datetime %s: %s", event_datetime, e
             )
-            return cursor.fetchone()
-        except Exception as e:
-            logger.error(f"Error finding event: {e}")
             return None
-        finally:
-            conn.close()
+        return EventRecord(
+            event_id,
+            chat_id,
+            message_id,
+            sender_id,
+            event_dt,
+            location,
+            updated_at,
+        )
 
-    def get_events_for_reminders(self):
-        """Get events that need reminders sent."""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            now = datetime.datetime.now(eastern)
-
-            cursor.execute(
-                """
-                SELECT id, chat_id, message_id, sender_id, event_datetime, location, updated_at
-                FROM events
-                WHERE event_datetime > ?
-            """,
-                (now.isoformat(),),
-            )
+    def get_events_due(self, today, days_before):
+        """Yield (event, days) for upcoming events falling `days` after today.
 
-            results = []
-            for row in cursor.fetchall():
-                # Parse the datetime string back to datetime object
-                try:
-                    event_dt = datetime.datetime.fromisoformat(
-                        row["event_datetime"]
-                    )
-                    results.append(
-                        (
-                            row["id"],
-                            row["chat_id"],
-                            row["message_id"],
-                            row["sender_id"],
-                            event_dt,
-                            row["location"],
-                            row["updated_at"],
-                        )
-                    )
-                except (ValueError, TypeError) as e:
-                    logger.error(
-                        f"Error parsing event datetime {row['event_datetime']}: {e}"
-                    )
-                    continue
-
-            return results
-        except Exception as e:
-            logger.error(f"Error getting events for reminders: {e}")
-            return []
-        finally:
-            conn.close()
+        Only events whose Eastern date is today plus one of the offsets in
+        `days_before` are read, so the caller never sees events with no
+        reminder due.
+        """
+        dates = {
+            (today + datetime.timedelta(days=days)).isoformat(): days
+            for days in days_before
+        }
+        # Dates are compared as the YYYY-MM-DD prefix of the stored Eastern
+        # ISO string; the range bounds keep the scan on idx_events_dt
+        last = today + datetime.timedelta(days=max(days_before) + 1)
+        with self._acquire_reader() as conn:
+            try:
+                now = datetime.datetime.now(eastern)
+                for row in conn.execute(
+                    SQL_GET_EVENTS_ON_DATES,
+                    (
+                        now.isoformat(),
+                        last.isoformat(),
+                        json.dumps(list(dates)),
+                    ),
+                ):
+                    event = self._parse_event(row)
+                    if event:
+                        yield event, dates[row[4][:10]]
+            except Exception as e:
+                logger.error("Error getting events due for reminders: %s", e)
+
+    def mark_reminder_sent(self, event_id, days_before):
+        """Record a reminder; return False if it had already been sent."""
+        with self._acquire_writer() as conn:
+            try:
+                bit = 1 << days_before
+                updated = conn.execute(
+                    SQL_MARK_REMINDER_SENT, (bit, event_id, bit)
+                ).rowcount
+                return updated > 0
+            except Exception as e:
+                logger.error("Error marking reminder as sent: %s", e)
+                # Sending a duplicate beats silently dropping the reminder
+                return True
 
     def delete_event(self, chat_id, message_id):
         """Delete an event."""
-        conn = self.get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                DELETE FROM events WHERE chat_id = ? AND message_id = ?
-            """,
-                (chat_id, message_id),
-            )
-            conn.commit()
-            logger.info(f"Deleted event {message_id}")
-        except Exception as e:
-            logger.error(f"Error deleting event: {e}")
-        finally:
-            conn.close()
+        with self._acquire_writer() as conn:
+            try:
+                conn.execute(
+                    SQL_DELETE_EVENT,
+                    (chat_id, message_id),
+                )
+                logger.info("Deleted event %s", message_id)
+            except Exception as e:
+                logger.error("Error deleting event: %s", e)
+
+    def purge_expired_events(self):
+        """Delete events that have already taken place.
+
+        Returns the number of events removed.
+        """
+        with self._acquire_writer() as conn:
+            try:
+                now = datetime.datetime.now(eastern)
+                purged = conn.execute(
+                    SQL_PURGE_EXPIRED_EVENTS, (now.isoformat(),)
+                ).rowcount
+                if purged:
+                    logger.info("Purged %d expired events", purged)
+                return purged
+            except Exception as e:
+                logger.error("Error purging expired events: %s", e)
+                return 0
+
+    def optimize(self):
+        """Refresh planner statistics that no longer match the tables.
+
+        Connections only load statistics when they open, so the pooled
+        readers are swapped for fresh ones afterwards.
+        """
+        with self._acquire_writer() as conn:
+            try:
+                conn.execute("PRAGMA optimize")
+            except Exception as e:
+                logger.error("Error optimizing database: %s", e)
+                return
+        for _ in range(READER_POOL_SIZE):
+            self._readers.get().close()
+            self._readers.put(self._connect(self._read_uri, uri=True))
+
+
+class AsyncDatabaseManager:
+    """Awaitable front for DatabaseManager used by the bot.
+
+    Each call runs on a worker thread via asyncio.to_thread, so SQLite I/O
+    and fsyncs never stall the event loop serving Telegram updates. Only
+    the methods the bot uses are exposed.
+    """
+
+    def __init__(self, db_path):
+        self.sync = DatabaseManager(db_path)
+
+    async def add_new_users(self, rows):
+        return await asyncio.to_thread(self.sync.add_new_users, rows)
+
+    async def upsert_private_chat_user(
+        self, chat_id, user_id, username, first_name
+    ):
+        return await asyncio.to_thread(
+            self.sync.upsert_private_chat_user,
+            chat_id,
+            user_id,
+            username,
+            first_name,
+        )
+
+    async def get_user_private_chat(self, user_id):
+        return await asyncio.to_thread(
+            self.sync.get_user_private_chat, user_id
+        )
+
+    async def mark_many_users_posted(self, pairs):
+        return await asyncio.to_thread(
+            self.sync.mark_many_users_posted, pairs
+        )
+
+    async def toggle_notification_subscription(self, user_id):
+        return await asyncio.to_thread(
+            self.sync.toggle_notification_subscription, user_id
+        )
+
+    async def get_users_for_notification(self):
+        return await asyncio.to_thread(self.sync.get_users_for_notification)
+
+    async def get_unwelcomed_users_non_private(self):
+        return await asyncio.to_thread(
+            self.sync.get_unwelcomed_users_non_private
+        )
+
+    async def mark_many_users_welcomed(self, pairs):
+        return await asyncio.to_thread(
+            self.sync.mark_many_users_welcomed, pairs
+        )
+
+    async def get_users_for_intro_reminder(self):
+        return await asyncio.to_thread(self.sync.get_users_for_intro_reminder)
+
+    async def mark_many_users_intro_sent(self, pairs):
+        return await asyncio.to_thread(
+            self.sync.mark_many_users_intro_sent, pairs
+        )
+
+    async def add_event(
+        self, chat_id, message_id, sender_id, event_datetime, location
+    ):
+        return await asyncio.to_thread(
+            self.sync.add_event,
+            chat_id,
+            message_id,
+            sender_id,
+            event_datetime,
+            location,
+        )
+
+    async def get_event(self, chat_id, message_id):
+        return await asyncio.to_thread(
+            self.sync.get_event, chat_id, message_id
+        )
+
+    async def mark_reminder_sent(self, event_id, days_before):
+        return await asyncio.to_thread(
+            self.sync.mark_reminder_sent, event_id, days_before
+        )
+
+    async def delete_event(self, chat_id, message_id):
+        return await asyncio.to_thread(
+            self.sync.delete_event, chat_id, message_id
+        )
+
+    async def purge_expired_events(self):
+        return await asyncio.to_thread(self.sync.purge_expired_events)
+
+    async def optimize(self):
+        return await asyncio.to_thread(self.sync.optimize)
+
+    async def get_events_due(self, today, days_before):
+        """Get events with a reminder due, fetched on the worker thread."""
+        return await asyncio.to_thread(
+            lambda: list(self.sync.get_events_due(today, days_before))
+        )
@@ -1,8 +1,11 @@
 #!/usr/bin/env python
 # Telegram Welcome Bot - Greets new members with scheduled follow-up messages
 # Now with SQLite persistence
+import asyncio
 import logging
+import functools
 import datetime
+from collections import defaultdict
 from telegram import (
     Update,
     InlineKeyboardButton,
@@ -19,8 +22,10 @@ from telegram.ext import (
     filters,
     CallbackQueryHandler,
 )
-from telegram.error import TelegramError, BadRequest, Forbidden
-import pytz
+from telegram.constants import MessageLimit
+from telegram.error import TelegramError
+from cachetools import TTLCache
+from zoneinfo import ZoneInfo
 import re
 import os
 import DatabaseManager
@@ -29,14 +34,19 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# ASCII-only \d and \s: the date and time are plain digits, and the slicing
+# parser in process_event_message relies on that
 EVENT_REGEX = re.compile(
-    r"#event\s+(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2})\s+(.+)"
+    r"#event\s+(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2})\s+(.+)", re.ASCII
 )
 
-# Enable logging
+# Messages whose text or caption carries the #event tag
+EVENT_TAG_FILTER = filters.Regex("#event") | filters.CaptionRegex("#event")
+
+# Enable logging; set LOG_LEVEL=INFO (or DEBUG) for verbose output
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "WARNING").upper(),
 )
 logger = logging.getLogger(__name__)
 
@@ -45,7 +55,7 @@ TOKEN = os.getenv("BOT_TOKEN")
 if not TOKEN:
     raise ValueError("BOT_TOKEN environment variable is required")
 
-eastern = pytz.timezone("US/Eastern")
+eastern = ZoneInfo("US/Eastern")
 
 # Database path - use /data for Fly.io volume mount, fallback to local for development
 DB_PATH = os.getenv(
@@ -57,8 +67,157 @@ DB_PATH = os.getenv(
 GROUP_RULES_LINK = os.getenv("GROUP_RULES_LINK")
 NEW_MEMBERS_FORM_LINK = os.getenv("NEW_MEMBERS_FORM_LINK")
 
+# Mention builders for group messages
+MENTION_USERNAME = "@{}".format
+MENTION_LINK = '<a href="tg://user?id={}">{}</a>'.format
+
+# Group message templates, built once with the links bound; callers only
+# pass the joined mentions
+WELCOME_TEMPLATE = (
+    "Привет, {mentions}! 👋 Добро пожаловать в нашу группу!\n\n"
+    "Будьте добры, представьтесь (если ещё не успели 🙃): расскажите немного о себе — кем вы являетесь профессионально и по жизни, "
+    "в чем нуждаетесь и как можете быть полезны другим участникам группы.\n\n"
+    'После этого, пожалуйста, заполните форму <a href="{form_link}"><b>базы участников группы</b></a>.\n\n'
+    'И обязательно прочитайте <a href="{rules_link}"><b>Правила нашей группы</b></a> 🧐'
+)
+INTRO_REMINDER_TEMPLATE = (
+    "Привет, {mentions}! 👋\n\n"
+    "Уже прошло несколько дней, но {you} так и не представились группе. "
+    "Пожалуйста, расскажите немного о себе в чате — это помогает всем участникам быстрее адаптироваться.\n\n"
+    'Не забудьте заполнить <a href="{form_link}"><b>форму участника</b></a>.\n\n'
+    'И обязательно прочитайте <a href="{rules_link}"><b>правила группы</b></a> 🧐'
+)
+WELCOME_MESSAGE = functools.partial(
+    WELCOME_TEMPLATE.format,
+    form_link=NEW_MEMBERS_FORM_LINK,
+    rules_link=GROUP_RULES_LINK,
+)
+# A single newcomer is addressed with the polite capitalised "Вы"
+INTRO_REMINDER_SINGLE = functools.partial(
+    INTRO_REMINDER_TEMPLATE.format,
+    you="Вы",
+    form_link=NEW_MEMBERS_FORM_LINK,
+    rules_link=GROUP_RULES_LINK,
+)
+INTRO_REMINDER_GROUP = functools.partial(
+    INTRO_REMINDER_TEMPLATE.format,
+    you="вы",
+    form_link=NEW_MEMBERS_FORM_LINK,
+    rules_link=GROUP_RULES_LINK,
+)
+
+# Event announcement and reminder body, filled with a header line, the event
+# datetime and its description
+EVENT_DETAILS_TEMPLATE = (
+    "{header}\n\n"
+    "📅 *Дата:* {dt:%Y-%m-%d}\n"
+    "⏰ *Время:* {dt:%H:%M}\n"
+    "📍 *Описание:* {location}\n"
+).format
+EVENT_CANCELLED_TEMPLATE = (
+    "❗**Внимание**: митап группы Нетворкинг отменился!\n\n"
+    "📅 *Дата митапа:* {dt:%Y-%m-%d}\n"
+).format
+
+# Daily job times (Eastern)
+DAILY_WELCOME_TIME = datetime.time(hour=18, minute=0, tzinfo=eastern)
+INTRO_REMINDER_TIME = datetime.time(hour=20, minute=0, tzinfo=eastern)
+EVENT_REMINDER_TIME = datetime.time(hour=9, minute=0, tzinfo=eastern)
+
+# Days of the month on which intro reminders go out
+INTRO_REMINDER_DAYS = (1, 8, 15, 22)
+
+# Days before an event on which reminders are sent (0 = event day)
+EVENT_REMINDER_DAYS = (7, 3, 1, 0)
+
+# Telegram's BadRequest text when the event post a reminder replies to has
+# been deleted; other "not found" errors (e.g. the chat) must not cancel it
+REPLY_TARGET_MISSING = "message to be replied not found"
+
 # Initialize database manager
-db = DatabaseManager.DatabaseManager(DB_PATH)
+db = DatabaseManager.AsyncDatabaseManager(DB_PATH)
+
+# How often buffered "user posted" marks are written to the database, and
+# how many may pile up before a flush happens straight away
+POSTED_FLUSH_INTERVAL = 5
+POSTED_FLUSH_THRESHOLD = 500
+
+# Users seen posting since the last flush, as {(chat_id, user_id), ...}
+posted_buffer = set()
+
+# Users whose posted mark has been written during this run, as
+# {chat_id: {user_id}}; filled only after a successful flush
+posted_users = defaultdict(set)
+
+# Set while the last flush failed; retries are then left to the periodic
+# job instead of being attempted on every incoming message
+posted_flush_failed = False
+
+# Upper bound on concurrent outgoing messages, so bulk sends to one chat
+# cannot starve every other chat of Telegram requests
+MAX_CONCURRENT_SENDS = 20
+send_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+
+# How long a chat's administrator list is trusted before re-fetching
+ADMIN_CACHE_TTL = 60
+
+# Administrator ids per chat, as {chat_id: frozenset(user_id, ...)}
+admin_cache = TTLCache(maxsize=1024, ttl=ADMIN_CACHE_TTL)
+
+# Updates are processed concurrently; handlers that must see a chat's
+# messages in order take that chat's lock, as {chat_id: asyncio.Lock}
+chat_locks = defaultdict(asyncio.Lock)
+
+
+def with_chat_lock(handler):
+    """Handle one update per chat at a time, in arrival order."""
+
+    @functools.wraps(handler)
+    async def wrapper(update, context):
+        chat = update.effective_chat
+        if chat is None:
+            return await handler(update, context)
+        async with chat_locks[chat.id]:
+            return await handler(update, context)
+
+    return wrapper
+
+
+async def is_chat_admin(context, chat_id, user_id):
+    """Check admin rights against a briefly cached administrator list."""
+    admin_ids = admin_cache.get(chat_id)
+    if admin_ids is None:
+        admins = await context.bot.get_chat_administrators(chat_id)
+        admin_ids = frozenset(admin.user.id for admin in admins)
+        admin_cache[chat_id] = admin_ids
+    return user_id in admin_ids
+
+
+async def send_message(bot, **kwargs):
+    """Send a message, bounded by MAX_CONCURRENT_SENDS in-flight requests."""
+    async with send_semaphore:
+        return await bot.send_message(**kwargs)
+
+
+async def send_to_users(bot, users, kind, **kwargs):
+    """Send the same message to every user concurrently.
+
+    Failures are logged per user as "Failed to send <kind> to user ...".
+    """
+
+    async def send_one(user):
+        try:
+            await send_message(bot, chat_id=user[0], **kwargs)
+        except Exception as e:
+            logger.error("Failed to send %s to user %s: %s", kind, user[0], e)
+
+    await asyncio.gather(*(send_one(user) for user in users))
+
+
+async def copy_message(bot, **kwargs):
+    """Copy a message under the same bound as send_message."""
+    async with send_semaphore:
+        return await bot.copy_message(**kwargs)
 
 
 async def set_menu_button_and_commands(application):
@@ -71,12 +230,8 @@ async def set_menu_button_and_commands(application):
     )
 
 
-def initialize_user_private_chat(**user_data):
-    user_id = user_data.get("user_id")
-    db.add_new_user(**user_data)
-    db.mark_users_intro_sent(user_id, [user_id])
-    db.mark_users_welcomed(user_id, [user_id])
-    db.mark_user_posted(user_id, user_id)
+async def initialize_user_private_chat(**user_data):
+    await db.upsert_private_chat_user(**user_data)
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -87,7 +242,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "first_name": user.first_name,
         "username": user.username,
     }
-    initialize_user_private_chat(**user_data)  # Mark user as having posted
+    await initialize_user_private_chat(**user_data)  # Mark user as having posted
     welcome_text = f"👋Добро пожаловать, {user.first_name}!\n\nХотите подписаться на уведомления о событиях?"
 
     # Inline button
@@ -107,18 +262,16 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def toggle_user_subscription(
     user_id: int, user_first_name: str, user_username=None
 ) -> str:
-    if not db.get_user_private_chat(user_id):
+    if not await db.get_user_private_chat(user_id):
         user_data = {
             "chat_id": user_id,
             "user_id": user_id,
             "first_name": user_first_name,
             "username": user_username,
         }
-        initialize_user_private_chat(**user_data)
+        await initialize_user_private_chat(**user_data)
 
-    db.toggle_notification_subscription(user_id)
-
-    if db.get_user_notification_status(user_id):
+    if await db.toggle_notification_subscription(user_id):
         return f"✅ Статус подписки обновлён для {user_first_name}. Теперь вы *подписаны*."
     else:
         return f"✅ Статус подписки обновлён для {user_first_name}. Теперь вы *не подписаны*."
@@ -161,199 +314,186 @@ async def greet_new_members(
 
     chat = update.effective_chat
 
+    new_users = []
     for new_member in update.message.new_chat_members:
         if new_member.id == context.bot.id:
             continue
 
-        # Add user to database (welcomed flag defaults to 0)
-        db.add_new_user(
-            chat_id=chat.id,
-            user_id=new_member.id,
-            username=new_member.username,
-            first_name=new_member.first_name,
+        new_users.append(
+            (
+                chat.id,
+                new_member.id,
+                new_member.username,
+                new_member.first_name,
+            )
         )
 
-        logger.info(
-            f"Added new member {new_member.username or new_member.first_name} to database"
-        )
+    # Add all joined users in one transaction (welcomed flag defaults to 0)
+    await db.add_new_users(new_users)
 
 
 async def handle_user_message(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
     """Mark user as having posted when they send a message."""
-    message_content = update.message.text or update.message.caption
-    if (
-        not update.message
-        or not message_content
-        or update.message.new_chat_members
-    ):
-        logger.info(f"Message is: {update.message}")
-        logger.info(f"Message text is: {message_content}")
+    message = update.message
+    if not message or message.new_chat_members:
+        logger.debug("Update without a message: %s", update)
         return
 
     user = update.effective_user
     chat = update.effective_chat
 
-    # Mark user as having posted
-    db.mark_user_posted(chat.id, user.id)
+    # Most messages come from members already marked; skip them cheaply
+    if user.id in posted_users[chat.id]:
+        return
+    if not (message.text or message.caption):
+        logger.debug("Message without text: %s", message)
+        return
 
+    # Mark user as having posted; written out by flush_posted_users
+    posted_buffer.add((chat.id, user.id))
+    if (
+        len(posted_buffer) >= POSTED_FLUSH_THRESHOLD
+        and not posted_flush_failed
+    ):
+        await flush_posted_buffer()
 
-async def send_daily_welcome(context: ContextTypes.DEFAULT_TYPE):
-    """Send welcome message at 6PM for all unwelcomed users in non-private chats."""
-    # Get all users who haven't been welcomed yet in non-private chats
-    unwelcomed_users = db.get_unwelcomed_users_non_private()
 
-    if not unwelcomed_users:
+async def flush_posted_buffer():
+    """Write every buffered poster to the database in one transaction."""
+    global posted_flush_failed
+    if not posted_buffer:
+        return
+    pairs = list(posted_buffer)
+    posted_buffer.clear()
+    if not await db.mark_many_users_posted(pairs):
+        # Keep them buffered so the next flush retries the write
+        posted_buffer.update(pairs)
+        posted_flush_failed = True
         return
+    posted_flush_failed = False
+    for chat_id, user_id in pairs:
+        posted_users[chat_id].add(user_id)
 
-    # Group users by chat_id
-    users_by_chat = {}
-    for chat_id, user_id, username, first_name in unwelcomed_users:
-        if chat_id not in users_by_chat:
-            users_by_chat[chat_id] = []
-        users_by_chat[chat_id].append((user_id, username, first_name))
 
-    # Send ONE welcome message per chat for ALL unwelcomed users in that chat
-    for chat_id, users in users_by_chat.items():
-        try:
-            # Get chat info for the welcome message
-            chat = await context.bot.get_chat(chat_id)
+async def flush_posted_users(context: ContextTypes.DEFAULT_TYPE):
+    """Periodically flush users who posted since the last run."""
+    await flush_posted_buffer()
 
-            # Create mentions for all users
-            mentions = []
-            user_ids_to_mark = []
 
-            for user_id, username, first_name in users:
-                if username:
-                    mentions.append(f"@{username}")
-                else:
-                    mentions.append(
-                        f'<a href="tg://user?id={user_id}">{first_name}</a>'
-                    )
-                user_ids_to_mark.append(user_id)
-
-            # Skip this chat if no users to welcome (all were in private chats)
-            if not mentions:
-                continue
-
-            # Create ONE welcome message for ALL users
-            if len(mentions) == 1:
-                welcome_message = (
-                    f"Привет, {mentions[0]}! 👋 Добро пожаловать в нашу группу!\n\n"
-                    f"Будьте добры, представьтесь (если ещё не успели 🙃): расскажите немного о себе — кем вы являетесь профессионально и по жизни, "
-                    f"в чем нуждаетесь и как можете быть полезны другим участникам группы.\n\n"
-                    f'После этого, пожалуйста, заполните форму <a href="{NEW_MEMBERS_FORM_LINK}"><b>базы участников группы</b></a>.\n\n'
-                    f'И обязательно прочитайте <a href="{GROUP_RULES_LINK}"><b>Правила нашей группы</b></a> 🧐'
-                )
-            else:
-                mentions_text = ", ".join(mentions[:-1]) + f" и {mentions[-1]}"
-                welcome_message = (
-                    f"Привет, {mentions_text}! 👋 Добро пожаловать в нашу группу!\n\n"
-                    f"Будьте добры, представьтесь (если ещё не успели 🙃): расскажите немного о себе — кем вы являетесь профессионально и по жизни, "
-                    f"в чем нуждаетесь и как можете быть полезны другим участникам группы.\n\n"
-                    f'После этого, пожалуйста, заполните форму <a href="{NEW_MEMBERS_FORM_LINK}"><b>базы участников группы</b></a>.\n\n'
-                    f'И обязательно прочитайте <a href="{GROUP_RULES_LINK}"><b>Правила нашей группы</b></a> 🧐'
-                )
+async def flush_posted_on_shutdown(application):
+    """Do not lose buffered posters when the bot stops."""
+    await flush_posted_buffer()
 
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text=welcome_message,
-                parse_mode="HTML",
-                disable_web_page_preview=True,
-            )
 
-            # Mark all users as welcomed
-            db.mark_users_welcomed(chat_id, user_ids_to_mark)
+def build_mentions(users):
+    """Mention (user_id, username, first_name) rows, by @username if set."""
+    return [
+        (
+            MENTION_USERNAME(username)
+            if username
+            else MENTION_LINK(user_id, first_name)
+        )
+        for user_id, username, first_name in users
+    ]
 
-            logger.info(
-                f"Sent welcome message to {len(users)} users in {chat.title}"
-            )
 
-        except TelegramError as e:
-            logger.error(
-                f"Failed to send welcome message to chat {chat_id}: {e}"
-            )
+def join_mentions(mentions):
+    """Join mentions as "a", "a и b" or "a, b и c"."""
+    if len(mentions) == 1:
+        return mentions[0]
+    return ", ".join(mentions[:-1]) + f" и {mentions[-1]}"
 
 
-async def send_intro_reminders(context: ContextTypes.DEFAULT_TYPE):
-    """Send intro reminders on specific days (1st, 8th, 15th, 22nd) for ALL users who haven't posted."""
-    today = datetime.date.today()
+def render_welcome(mentions):
+    """Welcome text for the newcomers of one chat."""
+    return WELCOME_MESSAGE(mentions=join_mentions(mentions))
 
-    # Check if today is one of the notification days
-    if today.day not in [1, 8, 15, 22]:
-        return
 
-    # Get ALL users who need intro reminders (joined 3+ days ago, haven't posted, not yet sent intro)
-    users_for_intro = db.get_users_for_intro_reminder()
+def render_intro_reminder(mentions):
+    """Intro reminder text for the silent members of one chat."""
+    template = (
+        INTRO_REMINDER_SINGLE if len(mentions) == 1 else INTRO_REMINDER_GROUP
+    )
+    return template(mentions=join_mentions(mentions))
 
-    if not users_for_intro:
-        return
 
+async def broadcast_to_chats(context, rows, render, mark_sent, kind):
+    """Send ONE message per chat mentioning ALL of that chat's users.
+
+    rows are (chat_id, user_id, username, first_name) tuples, render builds
+    the text from a chat's mentions, and mark_sent receives the
+    (chat_id, user_id) pairs of every chat that was reached.
+    """
     # Group users by chat_id
-    users_by_chat = {}
-    for chat_id, user_id, username, first_name in users_for_intro:
-        if chat_id not in users_by_chat:
-            users_by_chat[chat_id] = []
+    users_by_chat = defaultdict(list)
+    for chat_id, user_id, username, first_name in rows:
         users_by_chat[chat_id].append((user_id, username, first_name))
 
-    # Send ONE intro message per chat for ALL users who need it in that chat
-    for chat_id, users in users_by_chat.items():
-        try:
-            # Create mentions for all users
-            mentions = []
-            user_ids_to_mark = []
+    # Users from every chat are marked in one transaction once sending is done
+    sent_pairs = []
 
-            for user_id, username, first_name in users:
-                if username:
-                    mentions.append(f"@{username}")
-                else:
-                    mentions.append(
-                        f'<a href="tg://user?id={user_id}">{first_name}</a>'
-                    )
-                user_ids_to_mark.append(user_id)
-
-            # Skip this chat if no users to notify (all were in private chats)
-            if not mentions:
-                continue
-
-            # Create ONE intro reminder message for ALL users
-            if len(mentions) == 1:
-                message = (
-                    f"Привет, {mentions[0]}! 👋\n\n"
-                    f"Уже прошло несколько дней, но Вы так и не представились группе. "
-                    f"Пожалуйста, расскажите немного о себе в чате — это помогает всем участникам быстрее адаптироваться.\n\n"
-                    f'Не забудьте заполнить <a href="{NEW_MEMBERS_FORM_LINK}"><b>форму участника</b></a>.\n\n'
-                    f'И обязательно прочитайте <a href="{GROUP_RULES_LINK}"><b>правила группы</b></a> 🧐'
-                )
-            else:
-                mentions_text = ", ".join(mentions[:-1]) + f" и {mentions[-1]}"
-                message = (
-                    f"Привет, {mentions_text}! 👋\n\n"
-                    f"Уже прошло несколько дней, но вы так и не представились группе. "
-                    f"Пожалуйста, расскажите немного о себе в чате — это помогает всем участникам быстрее адаптироваться.\n\n"
-                    f'Не забудьте заполнить <a href="{NEW_MEMBERS_FORM_LINK}"><b>форму участника</b></a>.\n\n'
-                    f'И обязательно прочитайте <a href="{GROUP_RULES_LINK}"><b>правила группы</b></a> 🧐'
-                )
-
-            await context.bot.send_message(
+    async def send_chat(chat_id, users):
+        try:
+            await send_message(
+                context.bot,
                 chat_id=chat_id,
-                text=message,
+                text=render(build_mentions(users)),
                 parse_mode="HTML",
                 disable_web_page_preview=True,
             )
-
-            # Mark all users as having received intro reminder
-            db.mark_users_intro_sent(chat_id, user_ids_to_mark)
-
+            sent_pairs.extend((chat_id, user_id) for user_id, _, _ in users)
             logger.info(
-                f"Sent intro reminder to {len(users)} users in chat {chat_id}"
+                "Sent %s to %d users in chat %s", kind, len(users), chat_id
             )
-
         except TelegramError as e:
-            logger.error(
-                f"Failed to send intro message to chat {chat_id}: {e}"
+            logger.error("Failed to send %s to chat %s: %s", kind, chat_id, e)
+
+    # Chats are sent concurrently, bounded by send_semaphore
+    try:
+        await asyncio.gather(
+            *(
+                send_chat(chat_id, users)
+                for chat_id, users in users_by_chat.items()
             )
+        )
+    finally:
+        await mark_sent(sent_pairs)
+
+
+async def send_daily_welcome(context: ContextTypes.DEFAULT_TYPE):
+    """Send welcome message at 6PM for all unwelcomed users in non-private chats."""
+    # Get all users who haven't been welcomed yet in non-private chats
+    unwelcomed_users = await db.get_unwelcomed_users_non_private()
+
+    if not unwelcomed_users:
+        return
+
+    await broadcast_to_chats(
+        context,
+        unwelcomed_users,
+        render_welcome,
+        db.mark_many_users_welcomed,
+        "welcome message",
+    )
+
+
+async def send_intro_reminders(context: ContextTypes.DEFAULT_TYPE):
+    """Send intro reminders on specific days (1st, 8th, 15th, 22nd) for ALL users who haven't posted."""
+    # Get ALL users who need intro reminders (joined 3+ days ago, haven't posted, not yet sent intro)
+    users_for_intro = await db.get_users_for_intro_reminder()
+
+    if not users_for_intro:
+        return
+
+    await broadcast_to_chats(
+        context,
+        users_for_intro,
+        render_intro_reminder,
+        db.mark_many_users_intro_sent,
+        "intro reminder",
+    )
 
 
 async def process_event_message(message, context: ContextTypes.DEFAULT_TYPE):
@@ -362,9 +502,18 @@ async def process_event_message(message, context: ContextTypes.DEFAULT_TYPE):
     chat_id = message.chat_id
     msg_id = message.message_id
 
-    match = EVENT_REGEX.search(message_content)
+    # Anchor the match at each "#event" in turn: str.find skips the text
+    # between tags, and an earlier "#events" or URL must not hide the tag
+    match = None
+    idx = message_content.find("#event")
+    while idx != -1:
+        match = EVENT_REGEX.match(message_content, idx)
+        if match:
+            break
+        idx = message_content.find("#event", idx + 1)
     if not match:
-        await context.bot.send_message(
+        await send_message(
+            context.bot,
             chat_id=message.from_user.id,
             text="❗ Неверный формат команды #event. Используйте: `#event ГГГГ-ММ-ДД ЧЧ:ММ Локация`",
             parse_mode="Markdown",
@@ -374,13 +523,19 @@ async def process_event_message(message, context: ContextTypes.DEFAULT_TYPE):
     date_part, time_part, location = match.groups()
 
     try:
-        event_datetime = datetime.datetime.strptime(
-            f"{date_part} {time_part}", "%Y-%m-%d %H:%M"
+        # EVENT_REGEX fixes the digit layout, so slice instead of strptime
+        event_datetime = datetime.datetime(
+            int(date_part[0:4]),
+            int(date_part[5:7]),
+            int(date_part[8:10]),
+            int(time_part[0:2]),
+            int(time_part[3:5]),
         )
         if event_datetime.tzinfo is None:
-            event_datetime = eastern.localize(event_datetime)
+            event_datetime = event_datetime.replace(tzinfo=eastern)
     except Exception:
-        await context.bot.send_message(
+        await send_message(
+            context.bot,
             chat_id=message.from_user.id,
             text="❗ Неверный формат даты. Используйте: `#event ГГГГ-ММ-ДД ЧЧ:ММ Локация`",
             parse_mode="Markdown",
@@ -389,40 +544,39 @@ async def process_event_message(message, context: ContextTypes.DEFAULT_TYPE):
 
     now = datetime.datetime.now(eastern)
     if event_datetime <= now:
-        await context.bot.send_message(
+        await send_message(
+            context.bot,
             chat_id=message.from_user.id,
             text="❗ Дата события должна быть в будущем.",
         )
         return None
 
     # Store event in database
-    event_datetime = event_datetime.isoformat()
-    db.add_event(
-        chat_id, msg_id, message.from_user.id, event_datetime, location
+    await db.add_event(
+        chat_id,
+        msg_id,
+        message.from_user.id,
+        event_datetime.isoformat(),
+        location,
     )
 
     return event_datetime, location
 
 
+@with_chat_lock
 async def handle_event_tagged_message(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ):
     message = update.message
-    message_content = message.text or message.caption
-    if not message or not message_content:
-        logger.info(f"Message is: {message}")
-        logger.info(f"Message text is: {message_content}")
-        logger.info(f"Message text: {'#event' in message_content}")
+    if not message:
+        logger.debug("Update without a message: %s", update)
         return
 
     user = update.effective_user
     chat_id = message.chat_id
 
     # Admin check
-    admins = await context.bot.get_chat_administrators(chat_id)
-    is_admin = any(admin.user.id == user.id for admin in admins)
-
-    if not is_admin:
+    if not await is_chat_admin(context, chat_id, user.id):
         await message.reply_text(
             "Только администраторы могут создавать события."
         )
@@ -430,62 +584,56 @@ async def handle_event_tagged_message(
 
     result = await process_event_message(message, context)
     if result:
-        event_datetime, _ = result
-        event_datetime = datetime.datetime.fromisoformat(event_datetime)
-
         # Send event created notification to all subscribed users
         await send_event_notification_to_subscribers(
             context, message, is_new_event=True
         )
 
 
+@with_chat_lock
 async def handle_event_tagged_message_edit(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ):
-    logger.info("Handling edited message.")
+    """Update a stored event when its #event post is edited.
+
+    Only edits carrying the #event tag reach this handler (see main), so
+    the tag is not searched for again here; process_event_message parses
+    the post once with EVENT_REGEX.
+    """
+    logger.debug("Handling edited message.")
     user = update.effective_user
     edited_msg = update.edited_message
-    message_content = edited_msg.text or edited_msg.caption
-    chat_id = edited_msg.chat_id
-    if (
-        not edited_msg
-        or not message_content
-        or "#event" not in message_content
-    ):
-        logger.info(f"Edited message is: {edited_msg}")
-        logger.info(f"Edited message text is: {message_content}")
-        logger.info(
-            f"#event in edited message text: {'#event' in message_content}"
-        )
+    if not edited_msg:
         return
+    chat_id = edited_msg.chat_id
 
-    admins = await context.bot.get_chat_administrators(chat_id)
-    is_admin = any(admin.user.id == user.id for admin in admins)
-
-    if not is_admin:
+    if not await is_chat_admin(context, chat_id, user.id):
         await edited_msg.reply_text(
             "Только администраторы могут создавать события."
         )
         return
 
-    event = db.get_event(edited_msg.chat_id, edited_msg.message_id)
+    event = await db.get_event(edited_msg.chat_id, edited_msg.message_id)
 
     result = await process_event_message(edited_msg, context)
     if result:
         event_datetime, location = result
-        event_datetime = datetime.datetime.fromisoformat(event_datetime)
-        stored_dt = datetime.datetime.fromisoformat(event["event_datetime"])
-        stored_location = event["location"]
 
         if event:
             # Event updated
+            stored_dt = datetime.datetime.fromisoformat(
+                event["event_datetime"]
+            )
+            stored_location = event["location"]
             if location != stored_location or event_datetime != stored_dt:
-                await context.bot.send_message(
+                await send_message(
+                    context.bot,
                     chat_id=edited_msg.chat_id,
-                    text=f"✏️ *Митап обновлён*\n\n"
-                    f"📅 *Дата:* {event_datetime.strftime('%Y-%m-%d')}\n"
-                    f"⏰ *Время:* {event_datetime.strftime('%H:%M')}\n"
-                    f"📍 *Описание:* {location}\n",
+                    text=EVENT_DETAILS_TEMPLATE(
+                        header="✏️ *Митап обновлён*",
+                        dt=event_datetime,
+                        location=location,
+                    ),
                     parse_mode="Markdown",
                     reply_to_message_id=edited_msg.message_id,
                 )
@@ -504,6 +652,52 @@ async def handle_event_tagged_message_edit(
             )
 
 
+async def get_chat_subscribers(
+    context: ContextTypes.DEFAULT_TYPE, chat_id, users=None
+):
+    """Get subscribed users who are still members of the given chat.
+
+    Jobs handling several events can pass the subscriber list they already
+    fetched as ``users`` to skip the query.
+    """
+    if users is None:
+        users = await db.get_users_for_notification()
+
+    async def get_member(user):
+        async with send_semaphore:
+            return await context.bot.get_chat_member(chat_id, user[0])
+
+    # Look up every subscriber's membership concurrently; one failed lookup
+    # (e.g. a deleted account) must not cost everyone else the message
+    statuses = await asyncio.gather(
+        *(get_member(user) for user in users), return_exceptions=True
+    )
+
+    subscribers = []
+    for user, member_status in zip(users, statuses):
+        if isinstance(member_status, Exception):
+            logger.warning(
+                "Failed to check membership of user %s in chat %s: %s",
+                user[0],
+                chat_id,
+                member_status,
+            )
+            continue
+        if member_status.status not in [
+            member_status.ADMINISTRATOR,
+            member_status.MEMBER,
+            member_status.OWNER,
+        ]:
+            logger.debug(
+                "Skipping user %s (%s) - not a member of the chat",
+                user[0],
+                user[1],
+            )
+            continue
+        subscribers.append(user)
+    return subscribers
+
+
 async def send_event_notification_to_subscribers(
     context: ContextTypes.DEFAULT_TYPE,
     message,
@@ -511,97 +705,111 @@ async def send_event_notification_to_subscribers(
 ):
     """Send event notifications to all subscribed users."""
     try:
-        users_to_notify = db.get_users_for_notification()
+        users_to_notify = await get_chat_subscribers(context, message.chat_id)
         action_text = "Новый митап" if is_new_event else "Митап обновлён"
+        header = f"📢 <b>{action_text}</b>\n\n"
+
+        # One API call per subscriber: the header goes in front of the event
+        # text, or of the caption when the event is posted with media.
+        # Telegram counts the parsed text in UTF-16 units, so measure the
+        # header without its tags.
+        if message.text:
+            body, limit = message.text, MessageLimit.MAX_TEXT_LENGTH
+        else:
+            body, limit = message.caption, MessageLimit.CAPTION_LENGTH
+        full_text = f"📢 {action_text}\n\n{body}"
+        fits = len(full_text.encode("utf-16-le")) // 2 <= limit
 
-        for user in users_to_notify:
-            member_status = await context.bot.get_chat_member(
-                message.chat_id, user[0]
-            )
-            if member_status.status not in [
-                member_status.ADMINISTRATOR,
-                member_status.MEMBER,
-                member_status.OWNER,
-            ]:
-                logger.info(
-                    f"Skipping user {user[0]} ({user[1]}) - not a member of the chat"
-                )
-                continue
+        if message.text:
+            send, kwargs = send_message, {"text": header + message.text_html}
+        else:
+            send, kwargs = copy_message, {
+                "from_chat_id": message.chat_id,
+                "message_id": message.message_id,
+                "caption": header + message.caption_html,
+            }
+
+        async def notify(user):
             try:
-                # Send notification text
-                await context.bot.send_message(
-                    chat_id=user[0],
-                    text=f"📢 *{action_text}*\n\n",
-                    parse_mode="Markdown",
-                )
+                if not fits:
+                    # Too long to prefix: send the header, then the post as is
+                    await send_message(
+                        context.bot,
+                        chat_id=user[0],
+                        text=header,
+                        parse_mode="HTML",
+                    )
+                    await copy_message(
+                        context.bot,
+                        chat_id=user[0],
+                        from_chat_id=message.chat_id,
+                        message_id=message.message_id,
+                        disable_notification=True,
+                    )
+                    return
 
-                # Forward the actual event message
-                await context.bot.forward_message(
+                await send(
+                    context.bot,
                     chat_id=user[0],
-                    from_chat_id=message.chat_id,
-                    message_id=message.message_id,
-                    disable_notification=True,
+                    parse_mode="HTML",
+                    **kwargs,
                 )
 
             except Exception as e:
                 logger.error(
-                    f"Failed to send event notification to user {user[0]}: {e}"
+                    "Failed to send event notification to user %s: %s",
+                    user[0],
+                    e,
                 )
 
+        # Fan out to all subscribers at once; send_semaphore bounds it
+        await asyncio.gather(*(notify(user) for user in users_to_notify))
+
     except Exception as e:
-        logger.error(f"Failed to get users for notification: {e}")
+        logger.error("Failed to get users for notification: %s", e)
 
 
 async def check_and_send_event_reminders(context: ContextTypes.DEFAULT_TYPE):
     """Daily job to check for events that need reminders and send them at 9 AM."""
-    events = db.get_events_for_reminders()
     today = datetime.date.today()
+    events = await db.get_events_due(today, EVENT_REMINDER_DAYS)
 
-    logger.info(f"Checking event reminders for {today}")
+    logger.info("Checking event reminders for %s", today)
 
-    for (
-        event_id,
-        chat_id,
-        message_id,
-        _,
-        event_datetime,
-        location,
-        updated_at,
-    ) in events:
-        # Check each reminder period (7, 3, 1 days before, and event day)
-        reminder_days = [7, 3, 1, 0]  # 0 = event day
-        event_date = event_datetime.date()
-
-        # Find which reminder should be sent today (if any)
-        todays_reminder = None
-        for days_before in reminder_days:
-            reminder_date = event_date - datetime.timedelta(days=days_before)
-            if today == reminder_date:
-                todays_reminder = days_before
-                break
-
-        # If no reminder is due today, skip this event
-        if todays_reminder is None:
-            continue
+    # One subscriber query per run; member lists are resolved once per chat
+    subscribers = await db.get_users_for_notification()
+    subscribers_by_chat = {}
 
-        reminder_datetime = eastern.localize(
-            datetime.datetime.combine(today, datetime.time(9, 0))
-        )
+    # Reminders count as sent at 9 AM today, whichever event they are for
+    reminder_datetime = datetime.datetime.combine(
+        today, datetime.time(9, 0), tzinfo=eastern
+    )
 
+    for event, days_before in events:
         # Ensure updated_at is timezone-aware
-        updated_at_dt = datetime.datetime.fromisoformat(updated_at)
+        updated_at_dt = datetime.datetime.fromisoformat(event.updated_at)
         if updated_at_dt.tzinfo is None:
             # Assume Eastern if updated_at is naive
-            updated_at_dt = eastern.localize(updated_at_dt)
+            updated_at_dt = updated_at_dt.replace(tzinfo=eastern)
 
         if reminder_datetime < updated_at_dt:
             logger.info(
-                f"Skipping reminder for event {event_id} (reminder time: {reminder_datetime}, updated at: {updated_at_dt})"
+                "Skipping reminder for event %s (reminder time: %s, "
+                "updated at: %s)",
+                event.id,
+                reminder_datetime,
+                updated_at_dt,
             )
             continue
 
         # Send only today's reminder (skip any missed previous reminders)
-        days_before = todays_reminder
+        if not await db.mark_reminder_sent(event.id, days_before):
+            logger.info(
+                "Reminder for event %s (%d days before) already sent",
+                event.id,
+                days_before,
+            )
+            continue
         try:
             # Determine reminder text based on days_before
             if days_before == 0:
@@ -620,151 +828,122 @@ async def check_and_send_event_reminders(context: ContextTypes.DEFAULT_TYPE):
                 reminder_text = f"⏰ *Напоминаем: митап группы Нетворкинг состоится через {days_before} {day}!*"
                 days_text = f"Через {days_before} {day}"
 
-            message_content = (
-                f"{reminder_text}\n\n"
-                f"📅 *Дата:* {event_datetime.strftime('%Y-%m-%d')}\n"
-                f"⏰ *Время:* {event_datetime.strftime('%H:%M')}\n"
-                f"📍 *Описание:* {location}\n"
-            )
-
-            # Send to subscribed users
-            users_to_notify = db.get_users_for_notification()
-            logger.info(
-                f"Sending {days_text} reminder for event {event_id} to {len(users_to_notify)} users"
+            message_content = EVENT_DETAILS_TEMPLATE(
+                header=reminder_text,
+                dt=event.event_datetime,
+                location=event.location,
             )
 
-            for user in users_to_notify:
-                member_status = await context.bot.get_chat_member(
-                    chat_id, user[0]
+            # Send to group chat first: replying to the event post doubles
+            # as the check that it has not been deleted
+            try:
+                await send_message(
+                    context.bot,
+                    chat_id=event.chat_id,
+                    text=message_content,
+                    parse_mode="Markdown",
+                    reply_to_message_id=event.message_id,
                 )
-                if member_status.status not in [
-                    member_status.ADMINISTRATOR,
-                    member_status.MEMBER,
-                    member_status.OWNER,
-                ]:
-                    logger.info(
-                        f"Skipping user {user[0]} ({user[1]}) - not a member of the chat"
+            except TelegramError as e:
+                if REPLY_TARGET_MISSING in str(e).lower():
+                    logger.warning(
+                        "Event message %s for event %s is gone: %s",
+                        event.message_id,
+                        event.id,
+                        e,
                     )
+                    await cancel_deleted_event(context, event)
                     continue
-                try:
-                    await context.bot.send_message(
-                        chat_id=user[0],
-                        text=message_content,
-                        parse_mode="Markdown",
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to send reminder to user {user[0]}: {e}"
-                    )
+                # The reminder bit is already set, so a group failure must
+                # not cost the subscribers their copy
+                logger.error(
+                    "Failed to send reminder for event %s to chat %s: %s",
+                    event.id,
+                    event.chat_id,
+                    e,
+                )
 
-            # Send to group chat
-            await context.bot.send_message(
-                chat_id=chat_id,
+            # Send to subscribed users
+            users_to_notify = subscribers_by_chat.get(event.chat_id)
+            if users_to_notify is None:
+                users_to_notify = await get_chat_subscribers(
+                    context, event.chat_id, subscribers
+                )
+                subscribers_by_chat[event.chat_id] = users_to_notify
+            logger.info(
+                "Sending %s reminder for event %s to %d users",
+                days_text,
+                event.id,
+                len(users_to_notify),
+            )
+
+            await send_to_users(
+                context.bot,
+                users_to_notify,
+                "reminder",
                 text=message_content,
                 parse_mode="Markdown",
-                reply_to_message_id=message_id,
             )
 
-            logger.info(f"Sent {days_text} reminder for event {event_id}")
+            logger.info("Sent %s reminder for event %s", days_text, event.id)
 
         except Exception as e:
-            logger.error(f"Failed to send reminder for event {event_id}: {e}")
+            logger.error(
+                "Failed to send reminder for event %s: %s", event.id, e
+            )
 
+    # Past events can never be reminded of again; drop them once a day and
+    # let the planner statistics catch up with the tables
+    await db.purge_expired_events()
+    await db.optimize()
 
-async def cleanup_deleted_events(context: ContextTypes.DEFAULT_TYPE):
-    """Check for deleted event messages and clean up database."""
-    events = db.get_events_for_reminders()
 
-    for (
-        event_id,
-        chat_id,
-        message_id,
-        sender_id,
-        event_datetime,
-        _,
-        _,
-    ) in events:
-        try:
-            # Try to forward the message to check if it exists
-            forwarded_msg = await context.bot.forward_message(
-                chat_id=sender_id,
-                from_chat_id=chat_id,
-                message_id=message_id,
-                disable_notification=True,
-            )
-            # Delete the forwarded message immediately
-            await context.bot.delete_message(
-                chat_id=sender_id, message_id=forwarded_msg.message_id
-            )
-        except (BadRequest, Forbidden) as e:
-            logger.warning(
-                f"Failed to forward message {message_id} for event {event_id}: {e}"
-            )
-            # Message is deleted, notify sender and clean up
-            try:
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=(
-                        f"❗**Внимание**: митап группы Нетворкинг отменился!\n\n"
-                        f"📅 *Дата митапа:* {event_datetime.strftime('%Y-%m-%d')}\n"
-                    ),
-                    parse_mode="Markdown",
-                )
-                users_to_notify = db.get_users_for_notification()
-                for user in users_to_notify:
-                    member_status = await context.bot.get_chat_member(
-                        chat_id, user[0]
-                    )
-                    if member_status.status not in [
-                        member_status.ADMINISTRATOR,
-                        member_status.MEMBER,
-                        member_status.OWNER,
-                    ]:
-                        logger.info(
-                            f"Skipping user {user[0]} ({user[1]}) - not a member of the chat"
-                        )
-                        continue
-                    try:
-                        await context.bot.send_message(
-                            chat_id=user[0],
-                            text=(
-                                f"❗**Внимание**: митап группы Нетворкинг отменился!\n\n"
-                                f"📅 *Дата митапа:* {event_datetime.strftime('%Y-%m-%d')}\n"
-                            ),
-                            parse_mode="Markdown",
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to send event notification to user {user[0]}: {e}"
-                        )
-            except Exception:
-                pass  # User might have blocked the bot
-
-            # Delete from database
-            db.delete_event(chat_id, message_id)
-            logger.info(f"Deleted event {event_id} due to deleted message")
-
-
-def unified_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    message = update.effective_message
-    message_content = message.text or message.caption
-    logger.info(
-        f"Received message from {message.from_user.id} in chat {message.chat_id}: {message_content}"
-    )
+async def cancel_deleted_event(context: ContextTypes.DEFAULT_TYPE, event):
+    """Announce that an event was cancelled and remove it from the database."""
+    cancelled_text = EVENT_CANCELLED_TEMPLATE(dt=event.event_datetime)
+    try:
+        await send_message(
+            context.bot,
+            chat_id=event.chat_id,
+            text=cancelled_text,
+            parse_mode="Markdown",
+        )
+        users_to_notify = await get_chat_subscribers(context, event.chat_id)
+        await send_to_users(
+            context.bot,
+            users_to_notify,
+            "event notification",
+            text=cancelled_text,
+            parse_mode="Markdown",
+        )
+    except Exception:
+        pass  # User might have blocked the bot
 
-    if "#event" in message_content:
-        return handle_event_tagged_message(update, context)
-    else:
-        return handle_user_message(update, context)
+    # Delete from database
+    await db.delete_event(event.chat_id, event.message_id)
+    logger.info("Deleted event %s due to deleted message", event.id)
 
 
 def main() -> None:
     """Start the bot."""
+    # Run on uvloop where installed; it is optional and not built for Windows
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     # Create the Application
-    application = Application.builder().token(TOKEN).build()
+    # Process updates concurrently so one chat's slow request does not hold
+    # up the others; with_chat_lock keeps event posts and edits in order
+    application = (
+        Application.builder().token(TOKEN).concurrent_updates(True).build()
+    )
 
     # Set commands and menu before polling starts
     application.post_init = set_menu_button_and_commands
+    application.post_shutdown = flush_posted_on_shutdown
 
     application.add_handler(CommandHandler("start", start))
     application.add_handler(
@@ -785,42 +964,48 @@ def main() -> None:
 
     application.add_handler(
         MessageHandler(
-            filters.UpdateType.EDITED_MESSAGE, handle_event_tagged_message_edit
+            filters.UpdateType.EDITED_MESSAGE & EVENT_TAG_FILTER,
+            handle_event_tagged_message_edit,
         )
     )
 
-    # Add message handler for all messages
+    # Route #event posts and ordinary messages in the filter layer
+    text_messages = (filters.TEXT | filters.CAPTION) & ~filters.COMMAND
     application.add_handler(
         MessageHandler(
-            (filters.TEXT | filters.CAPTION) & ~filters.COMMAND,
-            unified_handler,
+            text_messages & EVENT_TAG_FILTER, handle_event_tagged_message
         )
     )
+    application.add_handler(
+        MessageHandler(text_messages & ~EVENT_TAG_FILTER, handle_user_message)
+    )
 
     # Schedule daily welcome at 6PM Eastern
     application.job_queue.run_daily(
         send_daily_welcome,
-        time=datetime.time(hour=18, minute=00, tzinfo=eastern),  # 6PM Eastern
+        time=DAILY_WELCOME_TIME,
         name="daily_welcome",
     )
 
-    # Schedule intro reminder check daily at 20PM Eastern (will only send on specific days)
-    application.job_queue.run_daily(
-        send_intro_reminders,
-        time=datetime.time(hour=20, minute=00, tzinfo=eastern),  # 20PM Eastern
-        name="intro_reminders",
-    )
+    # Schedule intro reminders at 20PM Eastern on their days of the month
+    for day in INTRO_REMINDER_DAYS:
+        application.job_queue.run_monthly(
+            send_intro_reminders,
+            when=INTRO_REMINDER_TIME,
+            day=day,
+            name=f"intro_reminders_{day}",
+        )
 
     application.job_queue.run_daily(
         check_and_send_event_reminders,
-        time=datetime.time(hour=9, minute=0, tzinfo=eastern),  # 9 AM Eastern
+        time=EVENT_REMINDER_TIME,
         name="daily_event_reminders",
     )
 
     application.job_queue.run_repeating(
-        cleanup_deleted_events,
-        interval=10800,  # Check every 3 hours
-        first=20,  # Start 20 seconds after bot startup
+        flush_posted_users,
+        interval=POSTED_FLUSH_INTERVAL,
+        name="flush_posted_users",
     )
 
     # Log when the bot starts
@@ -831,7 +1016,7 @@ def main() -> None:
         application.run_polling(allowed_updates=Update.ALL_TYPES)
         logger.info("Bot started successfully!")
     except Exception as e:
-        logger.error(f"Error starting bot: {e}")
+        logger.error("Error starting bot: %s", e)
         raise
 
 